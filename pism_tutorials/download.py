@@ -22,23 +22,745 @@
 Module provides download functions.
 """
 
+import asyncio
+import json
+import os
+import re
+import stat
+import tarfile
+import threading
+import time
+from collections.abc import Callable, Coroutine, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, TypeVar, cast
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+)
 from tqdm.notebook import tqdm
 
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
+
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Objects above the threshold are fetched as parallel ranged GETs. The body
+# is read and written to disk in 1 MiB pieces rather than many small writes.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    io_chunksize=1024 * 1024,
+    use_threads=True,
+)
+
+
+# Errors after which a download is attempted again.
+_RETRY_ERRORS = (BotoCoreError, OSError)
+
+_SESSION_LOCK = threading.Lock()
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> boto3.session.Session:
+    """
+    Return the boto3 session shared by all S3 clients of this module.
+
+    Credentials and configuration are only resolved once.
+
+    Returns
+    -------
+    boto3.session.Session
+        The shared session.
+    """
+    return boto3.session.Session()
+
+
+def _client_config(max_pool_connections: int = 10, probe: bool = False) -> Config:
+    """
+    Return the configuration of the S3 clients used for downloads.
+
+    The same settings are used by the boto3 and the aioboto3 clients.
+
+    Parameters
+    ----------
+    max_pool_connections : int, optional
+        Maximum number of connections kept in the client's pool, by default 10.
+    probe : bool, optional
+        Whether the client is only used for metadata requests, by default False.
+        Such requests are not retried and time out quickly, so that an
+        unreachable endpoint is detected without waiting for retries.
+
+    Returns
+    -------
+    botocore.config.Config
+        The client configuration.
+    """
+    if probe:
+        return Config(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=5,
+            retries={"total_max_attempts": 1},
+        )
+    return Config(
+        max_pool_connections=max_pool_connections,
+        retries={"max_attempts": 10, "mode": "adaptive"},
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_client(
+    max_pool_connections: int = 10, region_name: str | None = None, probe: bool = False
+) -> BaseClient:
+    """
+    Return a cached S3 client with a connection pool of the given size.
+
+    Clients are thread-safe, but creating them from a session is not, so
+    creation is serialized.
+
+    Parameters
+    ----------
+    max_pool_connections : int, optional
+        Maximum number of connections kept in the client's pool, by default 10.
+    region_name : str or None, optional
+        AWS region of the client. If None, the configured default region is used.
+    probe : bool, optional
+        Whether to return a client for metadata requests that fails fast
+        instead of retrying, by default False. See `_client_config`.
+
+    Returns
+    -------
+    botocore.client.BaseClient
+        The S3 client.
+    """
+    with _SESSION_LOCK:
+        return _get_session().client(
+            "s3",
+            region_name=region_name,
+            config=_client_config(max_pool_connections, probe),
+        )
+
+
+# Regions of buckets, only filled on successful lookups.
+_BUCKET_REGIONS: dict[str, str] = {}
+
+# Times of failed lookups, from time.monotonic, and how long they are reused.
+_BUCKET_REGION_FAILURES: dict[str, float] = {}
+_BUCKET_REGION_RETRY_INTERVAL = 60.0
+
+
+def bucket_region(s3_bucket: str) -> str | None:
+    """
+    Return the AWS region an S3 bucket is located in.
+
+    Parameters
+    ----------
+    s3_bucket : str
+        Name of the S3 bucket.
+
+    Returns
+    -------
+    str or None
+        The region of the bucket, or None if it could not be determined.
+
+    Notes
+    -----
+    S3 reports the region in the "x-amz-bucket-region" header of HeadBucket
+    responses, including error responses, so this works without the
+    s3:GetBucketLocation permission. The lookup is not retried, so it fails
+    fast when S3 cannot be reached. Successful lookups are cached; failed ones
+    are only tried again after `_BUCKET_REGION_RETRY_INTERVAL` seconds.
+    """
+    if s3_bucket in _BUCKET_REGIONS:
+        return _BUCKET_REGIONS[s3_bucket]
+    failed_at = _BUCKET_REGION_FAILURES.get(s3_bucket)
+    if (
+        failed_at is not None
+        and time.monotonic() - failed_at < _BUCKET_REGION_RETRY_INTERVAL
+    ):
+        return None
+    region = _lookup_bucket_region(s3_bucket)
+    if region is None:
+        _BUCKET_REGION_FAILURES[s3_bucket] = time.monotonic()
+    else:
+        _BUCKET_REGIONS[s3_bucket] = region
+        _BUCKET_REGION_FAILURES.pop(s3_bucket, None)
+    return region
+
+
+def _lookup_bucket_region(s3_bucket: str) -> str | None:
+    """
+    Request the AWS region of an S3 bucket from S3, see `bucket_region`.
+
+    Parameters
+    ----------
+    s3_bucket : str
+        Name of the S3 bucket.
+
+    Returns
+    -------
+    str or None
+        The region of the bucket, or None if it could not be determined.
+    """
+    s3_client = _get_client(probe=True)
+    try:
+        response = s3_client.head_bucket(Bucket=s3_bucket)
+    except ClientError as e:
+        response = e.response
+    except BotoCoreError:
+        return None
+    region = (
+        response.get("ResponseMetadata", {})
+        .get("HTTPHeaders", {})
+        .get("x-amz-bucket-region")
+    )
+    if region is None:
+        try:
+            location = s3_client.get_bucket_location(Bucket=s3_bucket)
+        except (BotoCoreError, ClientError):
+            return None
+        return location.get("LocationConstraint") or "us-east-1"
+    return region
+
+
+class _BatchedCallback:
+    """
+    Progress callback that forwards bytes to a progress bar in batches.
+
+    boto3 invokes the callback for every chunk read, possibly from several
+    threads; updating the notebook widget that often is costly, so updates
+    are accumulated until `flush_bytes` or `flush_interval` seconds are reached.
+
+    Parameters
+    ----------
+    pbar : tqdm.notebook.tqdm
+        The progress bar to update.
+    flush_bytes : int, optional
+        Number of accumulated bytes that triggers an update, by default 256 KiB.
+    flush_interval : float, optional
+        Time in seconds after which accumulated bytes are forwarded, by default 0.1.
+    """
+
+    def __init__(
+        self, pbar: tqdm, flush_bytes: int = 256 * 1024, flush_interval: float = 0.1
+    ):
+        """
+        Initialize the callback.
+
+        Parameters
+        ----------
+        pbar : tqdm.notebook.tqdm
+            The progress bar to update.
+        flush_bytes : int, optional
+            Number of accumulated bytes that triggers an update, by default 256 KiB.
+        flush_interval : float, optional
+            Seconds after which accumulated bytes are forwarded, by default 0.1.
+        """
+        self.pbar = pbar
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def __call__(self, num_bytes: int) -> None:
+        """
+        Record transferred bytes and update the progress bar if a batch is full.
+
+        Parameters
+        ----------
+        num_bytes : int
+            Number of bytes transferred since the last call.
+        """
+        with self.lock:
+            self.pending += num_bytes
+            if (
+                self.pending >= self.flush_bytes
+                or time.monotonic() - self.last_flush >= self.flush_interval
+            ):
+                self._flush()
+
+    def _flush(self) -> None:
+        """
+        Forward pending bytes to the progress bar; the caller holds the lock.
+        """
+        if self.pending:
+            self.pbar.update(self.pending)
+            self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """
+        Forward all pending bytes to the progress bar.
+        """
+        with self.lock:
+            self._flush()
+
+    def reset(self, initial: int = 0) -> None:
+        """
+        Discard pending bytes and reset the progress bar to `initial` bytes.
+
+        Parameters
+        ----------
+        initial : int, optional
+            Number of bytes already transferred, by default 0.
+        """
+        with self.lock:
+            self.pending = 0
+            self.pbar.reset()
+            self.pbar.update(initial)
+
+
+class _ProgressReader:
+    """
+    File-like wrapper that reports the number of bytes read to a callback.
+
+    Parameters
+    ----------
+    raw : IO[bytes]
+        Binary stream to read from.
+    callback : callable
+        Function called with the number of bytes of every read.
+    """
+
+    def __init__(self, raw: IO[bytes], callback: Callable[[int], None]):
+        """
+        Wrap a binary stream.
+
+        Parameters
+        ----------
+        raw : IO[bytes]
+            Binary stream to read from.
+        callback : callable
+            Function called with the number of bytes of every read.
+        """
+        self.raw = raw
+        self.callback = callback
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to `size` bytes and report them.
+
+        Parameters
+        ----------
+        size : int, optional
+            Maximum number of bytes to read. If negative, the stream is read
+            to its end, by default -1.
+
+        Returns
+        -------
+        bytes
+            The bytes read, empty at the end of the stream.
+        """
+        data = self.raw.read(size)
+        self.callback(len(data))
+        return data
+
+
+def _progress_bar(desc: str, total: int, position: int | None = None) -> tqdm:
+    """
+    Return a notebook progress bar counting bytes.
+
+    Parameters
+    ----------
+    desc : str
+        Description shown next to the progress bar.
+    total : int
+        Expected number of bytes.
+    position : int or None, optional
+        Position of the progress bar in the notebook, by default None.
+
+    Returns
+    -------
+    tqdm
+        The progress bar.
+    """
+    return tqdm(
+        total=total,
+        desc=desc,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        position=position,
+    )
+
+
+def etag_file(local_file_name: str | Path) -> Path:
+    """
+    Return the path of the sidecar file storing the ETag of a download.
+
+    Parameters
+    ----------
+    local_file_name : str or Path
+        Path of the downloaded file.
+
+    Returns
+    -------
+    Path
+        Path of the sidecar file, `local_file_name` with ".etag" appended.
+    """
+    return Path(f"{local_file_name}.etag")
+
+
+def is_up_to_date(
+    local_file_name: str | Path, meta_data: dict, size: int | None = None
+) -> bool:
+    """
+    Check whether a local file matches the S3 object described by `meta_data`.
+
+    The file is considered up to date if its size equals the object's
+    ContentLength and, if an ETag sidecar exists, the stored ETag equals the
+    object's ETag.
+
+    Parameters
+    ----------
+    local_file_name : str or Path
+        Path of the local file.
+    meta_data : dict
+        Response of a HeadObject request for the S3 object.
+    size : int or None, optional
+        Size of the local file in bytes, if already known. If None, the size
+        is requested from the file system.
+
+    Returns
+    -------
+    bool
+        True if the local file can be kept, False if it needs to be downloaded.
+    """
+    if size is None:
+        try:
+            size = os.path.getsize(local_file_name)
+        except OSError:
+            return False
+    if size != int(meta_data.get("ContentLength", -1)):
+        return False
+    etag = _read_etag(local_file_name)
+    return etag is None or etag == meta_data.get("ETag")
+
+
+def _local_file_sizes(files: list[str]) -> dict[str, int]:
+    """
+    Return the sizes of those `files` that exist as regular files.
+
+    Every file is only checked with a single `stat` call, and the sizes are
+    passed on to `is_up_to_date` so that it does not need to check again.
+
+    Parameters
+    ----------
+    files : list of str
+        Paths of the local files.
+
+    Returns
+    -------
+    dict of str to int
+        Size in bytes of each existing file, by path.
+    """
+    sizes: dict[str, int] = {}
+    for file_name in files:
+        try:
+            st = os.stat(file_name)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            sizes[file_name] = st.st_size
+    return sizes
+
+
+def _part_size(part_file_name: str) -> int:
+    """
+    Return the size of a partial download.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the ".part" file.
+
+    Returns
+    -------
+    int
+        Size of the file in bytes, or 0 if it does not exist.
+    """
+    try:
+        return os.path.getsize(part_file_name)
+    except OSError:
+        return 0
+
+
+def _read_etag(file_name: str | Path) -> str | None:
+    """
+    Return the ETag stored in the sidecar of a file.
+
+    Parameters
+    ----------
+    file_name : str or Path
+        Path of the downloaded or partially downloaded file.
+
+    Returns
+    -------
+    str or None
+        The stored ETag, or None if there is no readable sidecar.
+    """
+    try:
+        with open(etag_file(file_name), encoding="utf-8") as f:
+            return json.load(f).get("ETag")
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_stale_temp_files(part_file_name: str) -> None:
+    """
+    Remove temporary files s3transfer left behind for a ".part" file.
+
+    s3transfer downloads to "<part_file_name>.<8 hex digits>" and renames the
+    file when done; a killed process leaves these files behind.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the ".part" file.
+    """
+    part = Path(part_file_name)
+    pattern = re.compile(re.escape(part.name) + r"\.[0-9a-fA-F]{8}")
+    for temp_file in part.parent.glob(f"{part.name}.*"):
+        if pattern.fullmatch(temp_file.name):
+            temp_file.unlink(missing_ok=True)
+
+
+def _prepare_part(part_file_name: str, meta_data: dict) -> int:
+    """
+    Prepare the ".part" file of a download and return the offset to resume from.
+
+    A partial download is only resumed if the ETag recorded in its sidecar
+    when it was started matches the current object. Otherwise it is discarded
+    and the sidecar is written for a fresh download.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the ".part" file.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+
+    Returns
+    -------
+    int
+        Number of bytes already downloaded, 0 for a fresh download.
+    """
+    have = _part_size(part_file_name)
+    if (
+        0 < have < int(meta_data.get("ContentLength", 0))
+        and _read_etag(part_file_name) == meta_data["ETag"]
+    ):
+        return have
+    Path(part_file_name).unlink(missing_ok=True)
+    _write_etag(part_file_name, meta_data)
+    return 0
+
+
+def _start_part(
+    part_file_name: str, meta_data: dict, callback: _BatchedCallback
+) -> dict:
+    """
+    Start or resume a download into its ".part" file.
+
+    The progress is reset to the number of bytes already present. The request
+    is conditional on the ETag recorded for the ".part" file, so bytes of a
+    different object version are never appended to it.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the ".part" file.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+    callback : _BatchedCallback
+        Progress callback of the download.
+
+    Returns
+    -------
+    dict
+        Keyword arguments for GetObject to fetch the rest of the object.
+    """
+    offset = _prepare_part(part_file_name, meta_data)
+    callback.reset(offset)
+    args = {"IfMatch": meta_data["ETag"]}
+    if offset:
+        args["Range"] = f"bytes={offset}-"
+    return args
+
+
+@contextmanager
+def _append_to_part(
+    part_file_name: str, callback: _BatchedCallback
+) -> Iterator[Callable[[bytes], None]]:
+    """
+    Open a ".part" file for appending the chunks of a streamed object.
+
+    Chunks are written in pieces of `TRANSFER_CONFIG.io_chunksize` bytes and
+    reported to the progress callback.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the ".part" file.
+    callback : _BatchedCallback
+        Progress callback of the download.
+
+    Yields
+    ------
+    callable
+        Function writing one chunk to the ".part" file.
+    """
+    with open(part_file_name, "ab", buffering=TRANSFER_CONFIG.io_chunksize) as f:
+
+        def write(chunk: bytes) -> None:
+            f.write(chunk)
+            callback(len(chunk))
+
+        yield write
+
+
+def _stream_to_part(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_object_key: str,
+    part_file_name: str,
+    *,
+    meta_data: dict,
+    callback: _BatchedCallback,
+) -> None:
+    """
+    Stream an object into its ".part" file, resuming a partial download.
+
+    Parameters
+    ----------
+    s3_client : botocore.client.BaseClient
+        Boto3 S3 client instance.
+    s3_bucket : str
+        Name of the S3 bucket.
+    s3_object_key : str
+        Key of the object in the S3 bucket.
+    part_file_name : str
+        Path of the ".part" file.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+    callback : _BatchedCallback
+        Progress callback of the download.
+    """
+    response = s3_client.get_object(
+        Bucket=s3_bucket,
+        Key=s3_object_key,
+        **_start_part(part_file_name, meta_data, callback),
+    )
+    with _append_to_part(part_file_name, callback) as write:
+        for chunk in response["Body"].iter_chunks(TRANSFER_CONFIG.io_chunksize):
+            write(chunk)
+
+
+def _finish_part(part_file_name: str, local_file_name: str, meta_data: dict) -> None:
+    """
+    Move a completed ".part" file into place and record the object's ETag.
+
+    Parameters
+    ----------
+    part_file_name : str
+        Path of the completed ".part" file.
+    local_file_name : str
+        Final path of the downloaded file.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+    """
+    os.replace(part_file_name, local_file_name)
+    _write_etag(local_file_name, meta_data)
+    etag_file(part_file_name).unlink(missing_ok=True)
+
+
+def _write_etag(local_file_name: str | Path, meta_data: dict) -> None:
+    """
+    Store the ETag of a downloaded object in its sidecar file.
+
+    Parameters
+    ----------
+    local_file_name : str or Path
+        Path of the downloaded file.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+    """
+    with open(etag_file(local_file_name), "w", encoding="utf-8") as f:
+        json.dump({"ETag": meta_data.get("ETag")}, f)
+
+
+def _retry_delay(attempt: int, retries: int, backoff: float) -> float | None:
+    """
+    Return the wait time before the next attempt of a failed download.
+
+    The wait time doubles after every failed attempt.
+
+    Parameters
+    ----------
+    attempt : int
+        Zero-based number of the attempt that failed.
+    retries : int
+        Number of download attempts.
+    backoff : float
+        Wait time in seconds before the first retry.
+
+    Returns
+    -------
+    float or None
+        Wait time in seconds, or None if no attempts are left.
+    """
+    if attempt >= retries - 1:
+        return None
+    return backoff * 2**attempt
+
 
 def s3_download(
     s3_bucket: str,
     s3_object_key: str,
     local_file_name: str,
-    s3_client: boto3.client = boto3.client("s3"),
+    s3_client: BaseClient | None = None,
     tqdm_position: int = 1,
+    *,
+    transfer_config: TransferConfig = TRANSFER_CONFIG,
+    retries: int = 5,
+    backoff: float = 1.0,
+    meta_data: dict | None = None,
 ) -> None:
     """
     Download a file from an S3 bucket.
 
+    The object is written to `local_file_name` with ".part" appended and only
+    renamed to `local_file_name` once the download has completed, so an
+    interrupted download never leaves a truncated file behind.
+
+    Objects smaller than the multipart threshold of `transfer_config` are
+    streamed into the ".part" file. If a download is interrupted, the next
+    attempt, or the next call, only fetches the missing bytes, provided the
+    object's ETag still matches the one recorded when the download started.
+    Larger objects are fetched with parallel ranged GETs and start over after
+    an interruption.
+
     Parameters
     ----------
     s3_bucket : str
@@ -47,25 +769,189 @@ def s3_download(
         Key of the object in the S3 bucket.
     local_file_name : str
         Path to save the downloaded file locally.
-    s3_client : boto3.client, optional
-        Boto3 S3 client instance, by default boto3.client("s3").
+    s3_client : botocore.client.BaseClient or None, optional
+        Boto3 S3 client instance. If None, a shared client is used.
     tqdm_position : int, optional
         Position of the progress bar in the notebook, by default 1.
+    transfer_config : boto3.s3.transfer.TransferConfig, optional
+        Multipart transfer settings, by default TRANSFER_CONFIG.
+    retries : int, optional
+        Number of download attempts, by default 5.
+    backoff : float, optional
+        Wait time in seconds before the first retry, doubled after every
+        failed attempt, by default 1.0.
+    meta_data : dict or None, optional
+        Response of a HeadObject request for the object. If None, the object
+        is requested with HeadObject.
     """
-    meta_data = s3_client.head_object(Bucket=s3_bucket, Key=s3_object_key)
+    if s3_client is None:
+        s3_client = _get_client()
+    if meta_data is None:
+        meta_data = s3_client.head_object(Bucket=s3_bucket, Key=s3_object_key)
     total_length = int(meta_data.get("ContentLength", 0))
-    with tqdm(
-        total=total_length,
-        desc=s3_object_key,
-        unit="B",
-        unit_scale=True,
-        unit_divisor=1024,
-        position=tqdm_position,
-    ) as pbar:
-        with open(local_file_name, "wb") as f:
-            s3_client.download_fileobj(
-                s3_bucket, s3_object_key, f, Callback=pbar.update
-            )
+    with _progress_bar(s3_object_key, total_length, tqdm_position) as pbar:
+        part_file_name = f"{local_file_name}.part"
+        callback = _BatchedCallback(pbar)
+        for attempt in range(retries):
+            try:
+                if total_length < transfer_config.multipart_threshold:
+                    _stream_to_part(
+                        s3_client,
+                        s3_bucket,
+                        s3_object_key,
+                        part_file_name,
+                        meta_data=meta_data,
+                        callback=callback,
+                    )
+                else:
+                    _remove_stale_temp_files(part_file_name)
+                    callback.reset()
+                    s3_client.download_file(
+                        s3_bucket,
+                        s3_object_key,
+                        part_file_name,
+                        Config=transfer_config,
+                        Callback=callback,
+                    )
+                break
+            except _RETRY_ERRORS:
+                delay = _retry_delay(attempt, retries, backoff)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+        callback.flush()
+    _finish_part(part_file_name, local_file_name, meta_data)
+
+
+async def _as3_download(
+    s3_client: "AioBaseClient",
+    semaphore: asyncio.Semaphore,
+    s3_bucket: str,
+    s3_object_key: str,
+    local_file_name: str,
+    *,
+    meta_data: dict,
+    tqdm_position: int = 1,
+    retries: int = 5,
+    backoff: float = 1.0,
+) -> None:
+    """
+    Stream a small object from an S3 bucket with an aioboto3 client.
+
+    Counterpart of the streaming branch of `s3_download` for the asyncio code
+    path, with the same resume and retry behavior.
+
+    Parameters
+    ----------
+    s3_client : aiobotocore.client.AioBaseClient
+        Aioboto3 S3 client instance.
+    semaphore : asyncio.Semaphore
+        Semaphore bounding the number of concurrent downloads.
+    s3_bucket : str
+        Name of the S3 bucket.
+    s3_object_key : str
+        Key of the object in the S3 bucket.
+    local_file_name : str
+        Path to save the downloaded file locally.
+    meta_data : dict
+        Response of a HeadObject request for the object.
+    tqdm_position : int, optional
+        Position of the progress bar in the notebook, by default 1.
+    retries : int, optional
+        Number of download attempts, by default 5.
+    backoff : float, optional
+        Wait time in seconds before the first retry, doubled after every
+        failed attempt, by default 1.0.
+    """
+    part_file_name = f"{local_file_name}.part"
+    async with semaphore:
+        total_length = int(meta_data.get("ContentLength", 0))
+        with _progress_bar(s3_object_key, total_length, tqdm_position) as pbar:
+            callback = _BatchedCallback(pbar)
+            for attempt in range(retries):
+                try:
+                    response = await s3_client.get_object(
+                        Bucket=s3_bucket,
+                        Key=s3_object_key,
+                        **_start_part(part_file_name, meta_data, callback),
+                    )
+                    with _append_to_part(part_file_name, callback) as write:
+                        async for chunk in response["Body"].iter_chunks(
+                            TRANSFER_CONFIG.io_chunksize
+                        ):
+                            write(chunk)
+                    break
+                except _RETRY_ERRORS:
+                    delay = _retry_delay(attempt, retries, backoff)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+            callback.flush()
+    _finish_part(part_file_name, local_file_name, meta_data)
+
+
+async def _adownload_files(
+    s3_bucket: str,
+    meta_data: dict[str, dict],
+    max_workers: int,
+    region_name: str | None = None,
+) -> list[BaseException | None]:
+    """
+    Download objects concurrently on a single event loop.
+
+    Parameters
+    ----------
+    s3_bucket : str
+        Name of the S3 bucket.
+    meta_data : dict of str to dict
+        HeadObject responses of the objects to download, by object key.
+    max_workers : int
+        Maximum number of concurrent downloads.
+    region_name : str or None, optional
+        AWS region of the bucket. If None, the configured default region is used.
+
+    Returns
+    -------
+    list of BaseException or None
+        Exception raised for each object, in the order of `meta_data`, or None
+        if its download succeeded.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    async with aioboto3.Session().client(
+        "s3", region_name=region_name, config=_client_config(max_workers)
+    ) as s3_client:
+        return await asyncio.gather(
+            *(
+                _as3_download(s3_client, semaphore, s3_bucket, url, url, meta_data=meta)
+                for url, meta in meta_data.items()
+            ),
+            return_exceptions=True,
+        )
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion, also from within a running event loop.
+
+    Jupyter kernels already run an event loop, in which case the coroutine is
+    run on a separate thread.
+
+    Parameters
+    ----------
+    coro : coroutine
+        The coroutine to run.
+
+    Returns
+    -------
+    object
+        The result of the coroutine.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 def download_files(
@@ -81,17 +967,218 @@ def download_files(
     files : list of str
         List of object keys to download from the S3 bucket.
     max_workers : int, optional
-        Maximum number of threads to use for downloading, by default 4.
+        Maximum number of concurrent downloads, by default 4.
     overwrite : bool, optional
         Whether to overwrite existing files, by default False.
+
+    Raises
+    ------
+    RuntimeError
+        If one or more files could not be downloaded.
+
+    Notes
+    -----
+    Unless `overwrite` is True, existing files are only downloaded again if
+    their size or ETag differ from the S3 object, see `is_up_to_date`.
+
+    If aioboto3 is installed, objects below the multipart threshold of
+    `TRANSFER_CONFIG` are downloaded with asyncio on a single event loop, which
+    scales better to many small objects. Larger objects, and all objects if
+    aioboto3 is not installed, are downloaded with `s3_download` in a thread
+    pool.
     """
+    # A single client is shared by all threads. Each of the `max_workers`
+    # downloads may issue up to `max_concurrency` ranged GETs at once, and the
+    # connection pool must hold all of them or requests serialize on it.
+    # Requests to a bucket in another region are slower and are redirected,
+    # so talk to the bucket's region directly.
+    region_name = bucket_region(s3_bucket)
+    s3_client = _get_client(
+        max_pool_connections=max(10, max_workers * TRANSFER_CONFIG.max_concurrency),
+        region_name=region_name,
+    )
+    local_sizes = {} if overwrite else _local_file_sizes(files)
+
+    # HEAD requests are high-latency but tiny, so issue them concurrently. The
+    # responses decide what to download and are reused by the downloads. They
+    # are not retried, and once the endpoint turned out to be unreachable the
+    # remaining objects are not probed, so that local files are kept without
+    # delay when offline.
+    probe_client = _get_client(
+        max_pool_connections=max(10, max_workers), region_name=region_name, probe=True
+    )
+    unreachable: list[Exception] = []
+
+    def head(url: str) -> dict | Exception:
+        """
+        Return the HeadObject response for an object.
+
+        Parameters
+        ----------
+        url : str
+            Key of the object in the S3 bucket.
+
+        Returns
+        -------
+        dict or Exception
+            The response, or the exception raised by the request.
+        """
+        if unreachable:
+            return unreachable[0]
+        try:
+            return probe_client.head_object(Bucket=s3_bucket, Key=url)
+        except (EndpointConnectionError, ConnectTimeoutError) as e:
+            unreachable.append(e)
+            return e
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        heads = dict(zip(files, executor.map(head, files)))
+
+    failed: dict[str, BaseException] = {}
+    meta_data: dict[str, dict] = {}
+    for url, result in heads.items():
+        if isinstance(result, Exception):
+            if url in local_sizes:
+                print(f"Could not check {url}, keeping local file: {result}")
+            else:
+                print(f"Downloading {url} failed: {result}")
+                failed[url] = result
+        elif url not in local_sizes or not is_up_to_date(url, result, local_sizes[url]):
+            meta_data[url] = result
+    num_outdated = len(failed) + len(meta_data)
+
+    # Small objects are dominated by per-request latency and go through the
+    # event loop; large objects use multipart ranged GETs on the thread pool.
+    small: dict[str, dict] = {}
+    large: dict[str, dict] = {}
+    for url, meta in meta_data.items():
+        is_small = (
+            int(meta.get("ContentLength", 0)) < TRANSFER_CONFIG.multipart_threshold
+        )
+        (small if aioboto3 is not None and is_small else large)[url] = meta
+
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
-        for url in files:
-            if not Path(url).is_file() or overwrite:
-                futures.append(executor.submit(s3_download, s3_bucket, url, url))
+        futures = {
+            executor.submit(
+                s3_download, s3_bucket, url, url, s3_client, meta_data=meta
+            ): url
+            for url, meta in large.items()
+        }
+        if small:
+            results = _run(_adownload_files(s3_bucket, small, max_workers, region_name))
+            for url, error in zip(small, results):
+                if error is not None:
+                    print(f"Downloading {url} failed: {error}")
+                    failed[url] = error
         for future in as_completed(futures):
             try:
                 future.result()
-            except BaseException as e:  # Catching a more specific exception
-                print(f"An error occurred: {e}")
+            except Exception as e:
+                print(f"Downloading {futures[future]} failed: {e}")
+                failed[futures[future]] = e
+    if failed:
+        raise RuntimeError(
+            f"Failed to download {len(failed)} of {num_outdated} files: "
+            + ", ".join(failed)
+        )
+
+
+def _safe_members(
+    tar: tarfile.TarFile, dest_dir: str | Path
+) -> Iterator[tarfile.TarInfo]:
+    """
+    Yield the members of a tar archive that are safe to extract to `dest_dir`.
+
+    Used on Python versions without `tarfile.data_filter`. Only regular files
+    and directories with relative paths inside `dest_dir` are accepted.
+
+    Parameters
+    ----------
+    tar : tarfile.TarFile
+        The opened tar archive.
+    dest_dir : str or Path
+        Directory the archive is extracted into.
+
+    Yields
+    ------
+    tarfile.TarInfo
+        The members of the archive, in order.
+
+    Raises
+    ------
+    tarfile.TarError
+        If a member is unsafe to extract.
+    """
+    root = os.path.realpath(dest_dir)
+    for member in tar:
+        target = os.path.realpath(os.path.join(root, member.name))
+        if (
+            os.path.isabs(member.name)
+            or ".." in Path(member.name).parts
+            or os.path.commonpath([root, target]) != root
+        ):
+            raise tarfile.TarError(f"Refusing to extract {member.name!r}")
+        if not (member.isreg() or member.isdir()):
+            raise tarfile.TarError(f"Refusing to extract special file {member.name!r}")
+        yield member
+
+
+def download_bundle(
+    s3_bucket: str,
+    s3_object_key: str,
+    dest_dir: str | Path = ".",
+    s3_client: BaseClient | None = None,
+) -> None:
+    """
+    Download a tar archive from an S3 bucket and extract it while streaming.
+
+    Fetching a single bundle of many small files avoids the per-request
+    overhead of downloading them individually with `download_files`, which
+    makes it the faster way to fetch a complete tutorial dataset.
+
+    Parameters
+    ----------
+    s3_bucket : str
+        Name of the S3 bucket.
+    s3_object_key : str
+        Key of the archive in the S3 bucket. Archives ending in ".zst" are
+        decompressed with zstandard; gzip, bzip2 and xz compression as well as
+        uncompressed tar archives are detected automatically.
+    dest_dir : str or Path, optional
+        Directory to extract the archive into, by default the current directory.
+    s3_client : botocore.client.BaseClient or None, optional
+        Boto3 S3 client instance. If None, a shared client is used.
+
+    Raises
+    ------
+    ImportError
+        If the archive is zstandard-compressed but zstandard is not installed.
+    tarfile.TarError
+        If the archive contains members that are unsafe to extract, such as
+        absolute paths or paths outside `dest_dir`.
+
+    Examples
+    --------
+    >>> download_bundle("pism-cloud-data", "path/to/bundle.tar.zst", "data")
+    """
+    if s3_client is None:
+        s3_client = _get_client()
+    is_zst = s3_object_key.endswith(".zst")
+    if is_zst and zstandard is None:
+        raise ImportError(f"zstandard is required to extract {s3_object_key}")
+
+    response = s3_client.get_object(Bucket=s3_bucket, Key=s3_object_key)
+    with _progress_bar(s3_object_key, int(response.get("ContentLength", 0))) as pbar:
+        callback = _BatchedCallback(pbar)
+        stream = cast(IO[bytes], _ProgressReader(response["Body"], callback))
+        if is_zst:
+            stream = zstandard.ZstdDecompressor().stream_reader(stream)
+        with tarfile.open(fileobj=stream, mode="r|*") as tar:
+            # Reject absolute paths, paths outside dest_dir and special files.
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(dest_dir, filter="data")
+            else:
+                tar.extractall(dest_dir, members=_safe_members(tar, dest_dir))
+        callback.flush()
@@ -20,13 +20,24 @@
 Module provides functions for plotting.
 """
 
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import numpy as np
+import pandas as pd
 import pylab as plt
 from matplotlib import colors
 
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
+
 
 def qgis2cmap(
     filename: Path | str,
@@ -49,13 +60,136 @@ def qgis2cmap(
     -------
     matplotlib.colors.LinearSegmentedColormap
         The matplotlib colormap.
+
+    Notes
+    -----
+    Parsed colormaps are cached in memory and in a ".npy" file in the user's
+    cache directory, and only read again once the file's modification time or
+    size change.
+    """
+    path = Path(filename).resolve()
+    st = path.stat()
+    cmap = _qgis2cmap(str(path), st.st_mtime_ns, st.st_size, num_levels, name)
+    return cast(colors.LinearSegmentedColormap, cmap.copy())
+
+
+def _colormap_cache_file(filename: str, mtime_ns: int, size: int) -> Path:
+    """
+    Return the path of the ".npy" cache file for a QGIS colormap file.
+
+    Cache files live in "$XDG_CACHE_HOME/pism-tutorials", by default
+    "~/.cache/pism-tutorials", and are named after a hash of the file's path,
+    modification time and size. A file that is replaced or modified in any
+    other way thus gets a new cache file.
+
+    Parameters
+    ----------
+    filename : str
+        Absolute path of the QGIS colormap file.
+    mtime_ns : int
+        Modification time of the file in nanoseconds.
+    size : int
+        Size of the file in bytes.
+
+    Returns
+    -------
+    Path
+        The path of the cache file.
+    """
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    key = f"{filename}\0{mtime_ns}\0{size}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return cache_dir / "pism-tutorials" / f"{digest}.npy"
+
+
+def _read_qgis_colormap(filename: str, mtime_ns: int, size: int) -> np.ndarray:
     """
-    m_data = np.loadtxt(filename, skiprows=2, delimiter=",")[:, :-1]
-    values_scaled = (m_data[:, 0] - np.min(m_data[:, 0])) / (
-        np.max(m_data[:, 0]) - np.min(m_data[:, 0])
+    Read the value and RGBA columns of a QGIS colormap file.
+
+    The parsed array is stored in a ".npy" cache file, see `_colormap_cache_file`,
+    and read from there as long as it exists. An unreadable, empty or truncated
+    cache file is replaced. If the cache cannot be written, the file is parsed
+    every time.
+
+    Parameters
+    ----------
+    filename : str
+        Absolute path of the QGIS colormap file.
+    mtime_ns : int
+        Modification time of the file in nanoseconds.
+    size : int
+        Size of the file in bytes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with the columns value, red, green, blue and alpha.
+    """
+    cache_file = _colormap_cache_file(filename, mtime_ns, size)
+    try:
+        return np.load(cache_file)
+    except (OSError, ValueError, EOFError):
+        pass
+
+    # Columns are value, red, green, blue, alpha and label; skip the label.
+    m_data = pd.read_csv(filename, skiprows=2, header=None, usecols=range(5)).to_numpy(
+        dtype=float
     )
-    colors_scaled = m_data[:, 1::] / 255.0
-    m_colors = [(values_scaled[k], colors_scaled[k]) for k in range(len(values_scaled))]
+    # Write to a unique temporary file so that concurrent processes never
+    # write to the same file, then move it into place atomically.
+    tmp_name = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_file.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp_name = f.name
+            np.save(f, m_data)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+    return m_data
+
+
+@lru_cache(maxsize=64)
+def _qgis2cmap(
+    filename: str,
+    mtime_ns: int,
+    size: int,
+    num_levels: int,
+    name: str,
+) -> colors.LinearSegmentedColormap:
+    """
+    Parse a QGIS colormap file.
+
+    `mtime_ns` and `size` are part of the cache key, so that modified files are
+    read again.
+
+    Parameters
+    ----------
+    filename : str
+        Absolute path of the QGIS colormap file.
+    mtime_ns : int
+        Modification time of the file in nanoseconds.
+    size : int
+        Size of the file in bytes.
+    num_levels : int
+        The number of RGB quantization levels.
+    name : str
+        The name of the colormap.
+
+    Returns
+    -------
+    matplotlib.colors.LinearSegmentedColormap
+        The matplotlib colormap, shared by all callers with the same arguments.
+    """
+    m_data = _read_qgis_colormap(filename, mtime_ns, size)
+    values = m_data[:, 0]
+    vmin, vmax = values.min(), values.max()
+    values_scaled = (values - vmin) / (vmax - vmin)
+    colors_scaled = m_data[:, 1:] / 255.0
+    m_colors = list(zip(values_scaled.tolist(), colors_scaled.tolist()))
     cmap = colors.LinearSegmentedColormap.from_list(name, m_colors, N=num_levels)
 
     return cmap
@@ -76,13 +210,28 @@ def register_colormaps(path: str | Path | None = None) -> None:
     >>> register_colormaps()
     >>> register_colormaps('/path/to/colormap/files')
     """
+    cmap_files: Iterable[Path | Traversable]
     if path is not None:
         cmap_files = Path(path).glob("*.txt")
     else:
-        cmap_files = Path(
-            str(files("pism_tutorials.data").joinpath("*.txt"))
-        ).parent.glob("*.txt")
-    for cmap_file in cmap_files:
-        name = cmap_file.name.removesuffix(".txt")
-        cmap = qgis2cmap(cmap_file, name=name)
+        cmap_files = (
+            f for f in files("pism_tutorials.data").iterdir() if f.name.endswith(".txt")
+        )
+    new_files = {
+        name: cmap_file
+        for cmap_file in cmap_files
+        if (name := cmap_file.name.removesuffix(".txt")) not in plt.colormaps
+    }
+    if not new_files:
+        return
+
+    # Parse files concurrently, but register on the calling thread because the
+    # matplotlib colormap registry is not thread-safe.
+    with ThreadPoolExecutor(max_workers=min(8, len(new_files))) as executor:
+        cmaps = list(
+            executor.map(
+                lambda item: qgis2cmap(item[1], name=item[0]), new_files.items()
+            )
+        )
+    for cmap in cmaps:
         plt.colormaps.register(cmap)
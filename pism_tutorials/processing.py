@@ -21,10 +21,40 @@ Module provides processing functions.
 """
 
 import re
+from functools import lru_cache
 
 import xarray as xr
 
 
+@lru_cache(maxsize=1024)
+def _extract_id(regexp: str, source: str) -> str | int:
+    """
+    Extract the experiment identifier from `source` using `regexp`.
+
+    Parameters
+    ----------
+    regexp : str
+        Regular expression with a group matching the experiment identifier.
+    source : str
+        The string to search, usually the file name of a dataset.
+
+    Returns
+    -------
+    str or int
+        The experiment identifier, converted to int if it is an integer.
+
+    Raises
+    ------
+    ValueError
+        If `regexp` does not match `source`.
+    """
+    m_id_re = re.search(regexp, source)
+    if m_id_re is None:
+        raise ValueError(f"Pattern '{regexp}' does not match '{source}'")
+    group = m_id_re.group(1)
+    return int(group) if group.removeprefix("-").isdecimal() else group
+
+
 def preprocess_nc(
     ds: xr.Dataset,
     regexp: str = "id_(.+?)_",
@@ -61,7 +91,7 @@ def preprocess_nc(
 
     Raises
     ------
-    AssertionError
+    ValueError
         If the regular expression does not match any part of the filename.
 
     Notes
@@ -71,16 +101,11 @@ def preprocess_nc(
     if drop_dims is None:  # Initialize drop_dims if not provided
         drop_dims = ["nv4"]
 
-    m_id_re = re.search(regexp, ds.encoding["source"])
-    ds = ds.expand_dims(dim)
-    assert m_id_re is not None
-    m_id: str | int
-    try:
-        m_id = int(m_id_re.group(1))
-    except ValueError:  # Catch specific exception
-        m_id = str(m_id_re.group(1))
-    ds[dim] = [m_id]
-
-    return ds.drop_vars(drop_vars, errors="ignore").drop_dims(
+    m_id = _extract_id(regexp, ds.encoding["source"])
+
+    # Drop first so fewer variables are copied, and set the coordinate while
+    # expanding to avoid rebuilding the index afterwards.
+    ds = ds.drop_vars(drop_vars or [], errors="ignore").drop_dims(
         drop_dims, errors="ignore"
     )
+    return ds.expand_dims({dim: [m_id]})